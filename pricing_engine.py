@@ -1,23 +1,43 @@
 
+import hashlib
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Literal, List, Dict, Any
+from itertools import repeat
+from typing import Optional, Literal, List, Dict, Any, Tuple, Union
 
+from pydantic import ConfigDict
 
-@dataclass
+
+_RISK_LEVELS = ("low", "medium", "high")
+_RISK_CODES = {level: code for code, level in enumerate(_RISK_LEVELS)}
+
+
+@dataclass(slots=True, frozen=True)
 class PricingItemInput:
+    # Unknown keys (e.g. "qty", "unit_cost") are rejected at the tool
+    # boundary rather than silently priced at the defaults.
+    __pydantic_config__ = ConfigDict(extra="forbid")
+
     description: str
-    quantity: float = 1.0
+    # int | float so validated tool input keeps whole numbers as sent
+    # (120 stays 120 rather than becoming 120.0).
+    quantity: Union[int, float] = 1.0
     unit: str = "unit"
     category: Literal["labour", "materials", "equipment", "other"] = "other"
-    base_unit_cost: float = 0.0
+    base_unit_cost: Union[int, float] = 0.0
     risk_level: Literal["low", "medium", "high"] = "medium"
     notes: Optional[str] = None
     cost_basis_hint: Optional[str] = None
     escalation_hint: Optional[str] = None
 
 
+_RISK_BASE_MULTIPLIERS = {"low": 1.0, "medium": 1.05, "high": 1.1}
+
+
 def _risk_multiplier(risk_level: str, strategy: str) -> float:
-    base = {"low": 1.0, "medium": 1.05, "high": 1.1}.get(risk_level, 1.05)
+    base = _RISK_BASE_MULTIPLIERS.get(risk_level, _RISK_BASE_MULTIPLIERS["medium"])
     if strategy == "low_cost":
         return base * 0.97
     if strategy == "premium":
@@ -25,19 +45,88 @@ def _risk_multiplier(risk_level: str, strategy: str) -> float:
     return base
 
 
+# Strategy -> multipliers indexed by risk code, specialised once at import.
+# Unknown strategies price like "balanced", which applies no adjustment.
+_RISK_MULTIPLIER_TABLE = {
+    strategy: tuple(_risk_multiplier(level, strategy) for level in _RISK_LEVELS)
+    for strategy in ("low_cost", "balanced", "premium")
+}
+
+
+# Spec-text markers, compiled once into a single case-insensitive alternation
+# so the spec is scanned in one pass. Each named group maps to the analysis
+# markers it implies ("no escalation" is both a firm-price and an escalation
+# mention, and the alternation consumes it as one match).
+_SPEC_MARKER_PATTERNS = (
+    ("usd", r"usd|dollar"),
+    ("firm", r"firm for"),
+    ("no_escalation", r"no escalation"),
+    ("escalation", r"escalation"),
+    ("cpi", r"cpi"),
+)
+_SPEC_MARKER_GROUPS = {
+    "usd": ("usd",),
+    "firm": ("firm",),
+    "no_escalation": ("firm", "escalation"),
+    "escalation": ("escalation",),
+    "cpi": ("cpi",),
+}
+_SPEC_MARKER_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _SPEC_MARKER_PATTERNS),
+    re.IGNORECASE,
+)
+_SPEC_MARKERS = ("usd", "firm", "escalation", "cpi")
+
+
+# Bounded LRU of spec analyses keyed by (content digest, tender_type); the
+# same spec is typically re-analysed several times in one session.
+_SPEC_ANALYSIS_CACHE: "OrderedDict[Tuple[bytes, str], Dict[str, Any]]" = OrderedDict()
+_SPEC_ANALYSIS_CACHE_SIZE = 64
+_SPEC_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+
 def analyze_pricing_spec_text(text: str, tender_type: str = "unknown") -> Dict[str, Any]:
     """
     Very simple heuristic analysis. In your real repo you can expand this.
+
+    Results are memoized per spec content and tender type; each call gets
+    its own copy of the cached result.
     """
-    lower = text.lower()
+    key = (
+        hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(),
+        tender_type,
+    )
+    with _SPEC_ANALYSIS_CACHE_LOCK:
+        analysis = _SPEC_ANALYSIS_CACHE.get(key)
+        if analysis is not None:
+            _SPEC_ANALYSIS_CACHE.move_to_end(key)
+
+    if analysis is None:
+        analysis = _scan_pricing_spec_text(text, tender_type)
+        with _SPEC_ANALYSIS_CACHE_LOCK:
+            _SPEC_ANALYSIS_CACHE[key] = analysis
+            if len(_SPEC_ANALYSIS_CACHE) > _SPEC_ANALYSIS_CACHE_SIZE:
+                _SPEC_ANALYSIS_CACHE.popitem(last=False)
+
+    return {**analysis, "flags": list(analysis["flags"])}
+
+
+def _scan_pricing_spec_text(text: str, tender_type: str) -> Dict[str, Any]:
+    seen = dict.fromkeys(_SPEC_MARKERS, False)
+    for match in _SPEC_MARKER_RE.finditer(text):
+        for marker in _SPEC_MARKER_GROUPS[match.lastgroup]:
+            seen[marker] = True
+        if all(seen.values()):
+            break
+
     flags = []
     currency = "R"
-    if "usd" in lower or "dollar" in lower:
+    if seen["usd"]:
         currency = "$"
         flags.append("Possible USD currency mentioned.")
-    if "firm for" in lower or "no escalation" in lower:
+    if seen["firm"]:
         flags.append("Firm pricing / no escalation mentioned.")
-    if "escalation" in lower and "cpi" in lower:
+    if seen["escalation"] and seen["cpi"]:
         flags.append("CPI-based escalation mentioned.")
     return {
         "currency": currency,
@@ -55,16 +144,64 @@ def build_pricing_table(
     tax_rate_pct: float,
     currency_symbol: str,
 ) -> Dict[str, Any]:
-    line_items = []
-    subtotal_direct_cost = 0.0
+    return build_pricing_scenarios(
+        typed_items=typed_items,
+        strategies=[strategy],
+        overhead_pct=overhead_pct,
+        profit_margin_pct=profit_margin_pct,
+        contingency_pct=contingency_pct,
+        tax_rate_pct=tax_rate_pct,
+        currency_symbol=currency_symbol,
+    )[strategy]
+
 
-    for idx, item in enumerate(typed_items, start=1):
-        mult = _risk_multiplier(item.risk_level, strategy)
-        effective_unit_cost = item.base_unit_cost * mult
-        line_total = effective_unit_cost * item.quantity
-        subtotal_direct_cost += line_total
+def build_pricing_scenarios(
+    typed_items: List[PricingItemInput],
+    strategies: List[str],
+    overhead_pct: float,
+    profit_margin_pct: float,
+    contingency_pct: float,
+    tax_rate_pct: float,
+    currency_symbol: str,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build one pricing table per strategy, keyed by strategy.
 
-        line_items.append(
+    Only the risk multiplier depends on the strategy, so the per-item
+    columns are extracted once and shared by every scenario.
+    """
+    base_unit_costs = [item.base_unit_cost for item in typed_items]
+    base_unit_costs_2dp = list(map(round, base_unit_costs, repeat(2)))
+    quantities = [item.quantity for item in typed_items]
+    # Index into _RISK_LEVELS; unknown levels price as "medium".
+    risk_codes = [
+        _RISK_CODES.get(item.risk_level, _RISK_CODES["medium"]) for item in typed_items
+    ]
+
+    scenarios: Dict[str, Dict[str, Any]] = {}
+    for strategy in strategies:
+        if strategy in scenarios:
+            continue
+        risk_mults = _RISK_MULTIPLIER_TABLE.get(strategy, _RISK_MULTIPLIER_TABLE["balanced"])
+
+        # Numeric pass first, then build the output rows from the results.
+        effective_unit_costs = [
+            cost * risk_mults[code] for cost, code in zip(base_unit_costs, risk_codes)
+        ]
+        line_totals = [
+            cost * quantity for cost, quantity in zip(effective_unit_costs, quantities)
+        ]
+        # Plain left-to-right float total: sum() is compensated on 3.12+,
+        # which can move the rounded totals by a cent.
+        subtotal_direct_cost = 0.0
+        for line_total in line_totals:
+            subtotal_direct_cost += line_total
+
+        # Display rounding for the returned rows, done column-wise in one go.
+        effective_unit_costs_2dp = map(round, effective_unit_costs, repeat(2))
+        line_totals_2dp = map(round, line_totals, repeat(2))
+
+        line_items = [
             {
                 "line_no": idx,
                 "description": item.description,
@@ -72,15 +209,50 @@ def build_pricing_table(
                 "unit": item.unit,
                 "category": item.category,
                 "risk_level": item.risk_level,
-                "base_unit_cost": round(item.base_unit_cost, 2),
-                "effective_unit_cost": round(effective_unit_cost, 2),
-                "line_total_excl_markups": round(line_total, 2),
+                "base_unit_cost": base_unit_cost,
+                "effective_unit_cost": effective_unit_cost,
+                "line_total_excl_markups": line_total,
                 "notes": item.notes,
                 "cost_basis_hint": item.cost_basis_hint,
                 "escalation_hint": item.escalation_hint,
             }
-        )
+            for idx, (item, base_unit_cost, effective_unit_cost, line_total) in enumerate(
+                zip(typed_items, base_unit_costs_2dp, effective_unit_costs_2dp, line_totals_2dp),
+                start=1,
+            )
+        ]
+
+        scenarios[strategy] = {
+            "strategy": strategy,
+            "inputs": {
+                "overhead_pct": overhead_pct,
+                "profit_margin_pct": profit_margin_pct,
+                "contingency_pct": contingency_pct,
+                "tax_rate_pct": tax_rate_pct,
+                "currency_symbol": currency_symbol,
+            },
+            "line_items": line_items,
+            "totals": _pricing_totals(
+                subtotal_direct_cost,
+                overhead_pct=overhead_pct,
+                profit_margin_pct=profit_margin_pct,
+                contingency_pct=contingency_pct,
+                tax_rate_pct=tax_rate_pct,
+                currency_symbol=currency_symbol,
+            ),
+        }
+
+    return scenarios
 
+
+def _pricing_totals(
+    subtotal_direct_cost: float,
+    overhead_pct: float,
+    profit_margin_pct: float,
+    contingency_pct: float,
+    tax_rate_pct: float,
+    currency_symbol: str,
+) -> Dict[str, Any]:
     overhead_amount = subtotal_direct_cost * (overhead_pct / 100.0)
     contingency_amount = subtotal_direct_cost * (contingency_pct / 100.0)
     profit_base = subtotal_direct_cost + overhead_amount + contingency_amount
@@ -89,7 +261,7 @@ def build_pricing_table(
     tax_amount = total_excl_tax * (tax_rate_pct / 100.0)
     total_incl_tax = total_excl_tax + tax_amount
 
-    totals = {
+    return {
         "currency_symbol": currency_symbol,
         "subtotal_direct_cost": round(subtotal_direct_cost, 2),
         "overhead_pct": overhead_pct,
@@ -104,123 +276,124 @@ def build_pricing_table(
         "total_incl_tax": round(total_incl_tax, 2),
     }
 
-    return {
-        "strategy": strategy,
-        "inputs": {
-            "overhead_pct": overhead_pct,
-            "profit_margin_pct": profit_margin_pct,
-            "contingency_pct": contingency_pct,
-            "tax_rate_pct": tax_rate_pct,
-            "currency_symbol": currency_symbol,
-        },
-        "line_items": line_items,
-        "totals": totals,
-    }
 
+# Single-pass HTML escaping for user-supplied text interpolated into reports.
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+def _escape_html(value: Any) -> str:
+    return str(value).translate(_HTML_ESCAPE_TABLE)
 
-def render_pricing_report_html(
-    tender_context: Dict[str, Any],
-    company_context: Dict[str, Any],
-    pricing_model: Dict[str, Any],
-    additional_notes: Optional[str] = None,
-) -> str:
-    currency = pricing_model.get("totals", {}).get("currency_symbol", "R")
-    totals = pricing_model.get("totals", {})
-    line_items = pricing_model.get("line_items", [])
-    tender_title = tender_context.get("tender_title") or ""
-    tender_reference = tender_context.get("tender_reference") or ""
-    company_name = company_context.get("company_name") or ""
 
-    rows_html = ""
-    for item in line_items:
-        rows_html += f"""
+# Report templates are plain format strings, parsed once at import and
+# filled with str.format_map per render. Only the head and body carry
+# placeholders; the stylesheet between them is static.
+_REPORT_ROW_TMPL = """
         <tr>
-          <td>{item['line_no']}</td>
-          <td>{item['description']}</td>
-          <td>{item['quantity']}</td>
-          <td>{item['unit']}</td>
-          <td>{item['category']}</td>
-          <td>{item['risk_level'].title()}</td>
-          <td style='text-align:right;'>{currency} {item['effective_unit_cost']:.2f}</td>
-          <td style='text-align:right;'>{currency} {item['line_total_excl_markups']:.2f}</td>
+          <td>{line_no}</td>
+          <td>{description}</td>
+          <td>{quantity}</td>
+          <td>{unit}</td>
+          <td>{category}</td>
+          <td>{risk_level_title}</td>
+          <td style='text-align:right;'>{currency} {effective_unit_cost:.2f}</td>
+          <td style='text-align:right;'>{currency} {line_total_excl_markups:.2f}</td>
         </tr>
         """
 
-    notes_block = (
-        f"<p>{additional_notes}</p>" if additional_notes else "<p>No additional notes.</p>"
-    )
+_REPORT_TENDER_FIELDS = ("tender_title", "tender_reference")
+_REPORT_COMPANY_FIELDS = ("company_name",)
 
-    html = f"""<!doctype html>
+_REPORT_TOTALS_DEFAULTS = {
+    "subtotal_direct_cost": 0,
+    "overhead_pct": 0,
+    "overhead_amount": 0,
+    "contingency_pct": 0,
+    "contingency_amount": 0,
+    "profit_margin_pct": 0,
+    "profit_amount": 0,
+    "tax_rate_pct": 0,
+    "tax_amount": 0,
+    "total_excl_tax": 0,
+    "total_incl_tax": 0,
+}
+
+_REPORT_HEAD_TMPL = """<!doctype html>
 <html>
 <head>
   <meta charset="utf-8" />
   <title>Pricing Report - {company_name}</title>
-  <style>
-    body {{
+"""
+
+# Static stylesheet and body opening; emitted verbatim, never formatted.
+_REPORT_STYLE = """  <style>
+    body {
       font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
       margin: 24px;
       background: #f9fafb;
       color: #111827;
-    }}
-    .card {{
+    }
+    .card {
       background: #ffffff;
       border-radius: 12px;
       padding: 24px;
       box-shadow: 0 10px 15px -3px rgba(15,23,42,0.08),
                   0 4px 6px -4px rgba(15,23,42,0.10);
-    }}
-    h1, h2, h3 {{
+    }
+    h1, h2, h3 {
       margin-top: 0;
       color: #0b1120;
-    }}
-    .header-grid {{
+    }
+    .header-grid {
       display: grid;
       grid-template-columns: 1.5fr 1fr;
       gap: 16px;
       margin-bottom: 24px;
-    }}
-    .muted {{
+    }
+    .muted {
       color: #6b7280;
       font-size: 0.875rem;
-    }}
-    table {{
+    }
+    table {
       width: 100%;
       border-collapse: collapse;
       margin-top: 16px;
       font-size: 0.875rem;
-    }}
-    th, td {{
+    }
+    th, td {
       border-bottom: 1px solid #e5e7eb;
       padding: 8px 6px;
       vertical-align: top;
-    }}
-    th {{
+    }
+    th {
       text-align: left;
       background: #f3f4f6;
       font-weight: 600;
       color: #374151;
-    }}
-    .totals {{
+    }
+    .totals {
       margin-top: 24px;
       max-width: 360px;
       margin-left: auto;
       font-size: 0.9rem;
-    }}
-    .totals-row {{
+    }
+    .totals-row {
       display: flex;
       justify-content: space-between;
       margin-bottom: 4px;
-    }}
-    .totals-row strong {{
+    }
+    .totals-row strong {
       font-weight: 600;
-    }}
-    .totals-row.total {{
+    }
+    .totals-row.total {
       margin-top: 8px;
       padding-top: 8px;
       border-top: 1px solid #e5e7eb;
       font-size: 1rem;
-    }}
-    .badge {{
+    }
+    .badge {
       display: inline-block;
       padding: 2px 8px;
       border-radius: 999px;
@@ -228,24 +401,26 @@ def render_pricing_report_html(
       background: #e5e7eb;
       color: #374151;
       margin-left: 4px;
-    }}
-    .badge-public {{
+    }
+    .badge-public {
       background: #dbeafe;
       color: #1d4ed8;
-    }}
-    .badge-private {{
+    }
+    .badge-private {
       background: #dcfce7;
       color: #15803d;
-    }}
-    .notes {{
+    }
+    .notes {
       margin-top: 24px;
       font-size: 0.9rem;
       color: #4b5563;
-    }}
+    }
   </style>
 </head>
 <body>
-  <div class="card">
+"""
+
+_REPORT_BODY_TMPL = """  <div class="card">
     <div class="header-grid">
       <div>
         <h1>Pricing Proposal</h1>
@@ -258,9 +433,9 @@ def render_pricing_report_html(
       <div style="text-align:right;">
         <h3>Summary</h3>
         <div class="muted">
-          <div>Total (excl. tax): <strong>{currency} {totals.get('total_excl_tax', 0):.2f}</strong></div>
-          <div>Tax ({totals.get('tax_rate_pct', 0):.0f}%): <strong>{currency} {totals.get('tax_amount', 0):.2f}</strong></div>
-          <div>Total (incl. tax): <strong>{currency} {totals.get('total_incl_tax', 0):.2f}</strong></div>
+          <div>Total (excl. tax): <strong>{currency} {total_excl_tax:.2f}</strong></div>
+          <div>Tax ({tax_rate_pct:.0f}%): <strong>{currency} {tax_amount:.2f}</strong></div>
+          <div>Total (incl. tax): <strong>{currency} {total_incl_tax:.2f}</strong></div>
         </div>
       </div>
     </div>
@@ -287,31 +462,31 @@ def render_pricing_report_html(
     <div class="totals">
       <div class="totals-row">
         <span>Direct cost subtotal</span>
-        <span>{currency} {totals.get('subtotal_direct_cost', 0):.2f}</span>
+        <span>{currency} {subtotal_direct_cost:.2f}</span>
       </div>
       <div class="totals-row">
-        <span>Overheads ({totals.get('overhead_pct', 0):.0f}%)</span>
-        <span>{currency} {totals.get('overhead_amount', 0):.2f}</span>
+        <span>Overheads ({overhead_pct:.0f}%)</span>
+        <span>{currency} {overhead_amount:.2f}</span>
       </div>
       <div class="totals-row">
-        <span>Contingency ({totals.get('contingency_pct', 0):.0f}%)</span>
-        <span>{currency} {totals.get('contingency_amount', 0):.2f}</span>
+        <span>Contingency ({contingency_pct:.0f}%)</span>
+        <span>{currency} {contingency_amount:.2f}</span>
       </div>
       <div class="totals-row">
-        <span>Profit ({totals.get('profit_margin_pct', 0):.0f}%)</span>
-        <span>{currency} {totals.get('profit_amount', 0):.2f}</span>
+        <span>Profit ({profit_margin_pct:.0f}%)</span>
+        <span>{currency} {profit_amount:.2f}</span>
       </div>
       <div class="totals-row total">
         <strong>Total excl. tax</strong>
-        <strong>{currency} {totals.get('total_excl_tax', 0):.2f}</strong>
+        <strong>{currency} {total_excl_tax:.2f}</strong>
       </div>
       <div class="totals-row">
-        <span>Tax ({totals.get('tax_rate_pct', 0):.0f}%)</span>
-        <span>{currency} {totals.get('tax_amount', 0):.2f}</span>
+        <span>Tax ({tax_rate_pct:.0f}%)</span>
+        <span>{currency} {tax_amount:.2f}</span>
       </div>
       <div class="totals-row total">
         <strong>Total incl. tax</strong>
-        <strong>{currency} {totals.get('total_incl_tax', 0):.2f}</strong>
+        <strong>{currency} {total_incl_tax:.2f}</strong>
       </div>
     </div>
 
@@ -323,4 +498,71 @@ def render_pricing_report_html(
 </body>
 </html>
 """
-    return html
+
+
+def _report_header_context(
+    tender_context: Dict[str, Any], company_context: Dict[str, Any]
+) -> Dict[str, str]:
+    """
+    Normalize the header fields in one pass: missing or empty values become
+    "", and everything is HTML-escaped.
+    """
+    return {
+        key: _escape_html(context.get(key) or "")
+        for context, keys in (
+            (tender_context, _REPORT_TENDER_FIELDS),
+            (company_context, _REPORT_COMPANY_FIELDS),
+        )
+        for key in keys
+    }
+
+
+def _report_row_context(item: Dict[str, Any], currency: str) -> Dict[str, Any]:
+    return {
+        **item,
+        "line_no": _escape_html(item["line_no"]),
+        "description": _escape_html(item["description"]),
+        "quantity": _escape_html(item["quantity"]),
+        "unit": _escape_html(item["unit"]),
+        "category": _escape_html(item["category"]),
+        "currency": currency,
+        "risk_level_title": _escape_html(item["risk_level"].title()),
+    }
+
+
+def render_pricing_report_html(
+    tender_context: Dict[str, Any],
+    company_context: Dict[str, Any],
+    pricing_model: Dict[str, Any],
+    additional_notes: Optional[str] = None,
+) -> str:
+    totals = pricing_model.get("totals", {})
+    currency = _escape_html(totals.get("currency_symbol", "R"))
+    line_items = pricing_model.get("line_items", [])
+
+    rows_html = "".join(
+        _REPORT_ROW_TMPL.format_map(_report_row_context(item, currency))
+        for item in line_items
+    )
+
+    notes_block = (
+        f"<p>{_escape_html(additional_notes)}</p>"
+        if additional_notes
+        else "<p>No additional notes.</p>"
+    )
+
+    ctx = {
+        **_REPORT_TOTALS_DEFAULTS,
+        **totals,
+        **_report_header_context(tender_context, company_context),
+        "currency": currency,
+        "rows_html": rows_html,
+        "notes_block": notes_block,
+    }
+    return "".join(
+        (
+            _REPORT_HEAD_TMPL.format_map(ctx),
+            _REPORT_STYLE,
+            _REPORT_BODY_TMPL.format_map(ctx),
+        )
+    )
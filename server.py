@@ -1,12 +1,19 @@
 
+import asyncio
+import operator
 import os
-from typing import List, Optional, Literal, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from types import MappingProxyType
+from typing import List, Optional, Literal, Dict, Any, Callable, Final, Mapping, TypeVar
 
 from fastmcp import FastMCP
 
 from pricing_engine import (
     PricingItemInput,
     analyze_pricing_spec_text,
+    build_pricing_scenarios,
     build_pricing_table,
     render_pricing_report_html,
 )
@@ -14,9 +21,65 @@ from pricing_engine import (
 # FastMCP server instance (Cloud will discover this as `mcp`)
 mcp = FastMCP(name="tri-tender-pricing-mcp")
 
+# Shared pool for CPU-bound tool bodies (spec analysis, pricing, report
+# rendering) so they never block the server's event loop.
+_POOL = ThreadPoolExecutor(
+    max_workers=(os.cpu_count() or 1) * 2, thread_name_prefix="tri-tender-pricing"
+)
+
+
+_T = TypeVar("_T")
+
+
+async def _run_in_pool(func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL, partial(func, *args, **kwargs))
+
+
+# Responses of pricing_entrypoint that do not depend on the request; each
+# call copies one and adds its tender_context (and analysis) on top. The
+# bases are read-only so no call can leak state into the next.
+_MISSING_SPEC_INSTRUCTIONS: Final[str] = (
+    "No structured pricing_requirements were provided to the "
+    "tri-tender-pricing-mcp.\n\n"
+    "Next steps for the client LLM (Tri-Tender Orchestrator):\n"
+    "1) Ask the user to upload the pricing schedule / Bill of "
+    "   Quantities (BOQ) or any annexure that contains the "
+    "   rates, quantities and units to be priced.\n"
+    "2) Use the 'tender-docs-mcp-file-resource' MCP to parse the "
+    "   uploaded pricing document and extract line items into a "
+    "   structured list.\n"
+    "   Example (pseudo-call):\n"
+    "     tender-docs-mcp-file-resource__extract_pricing_requirements(\n"
+    "         file=uploaded_pricing_file\n"
+    "     )\n"
+    "3) Call pricing_entrypoint AGAIN, this time passing the "
+    "   extracted pricing_requirements list into this tool.\n"
+)
+
+_READY_INSTRUCTIONS: Final[str] = (
+    "You may now call `build_pricing_model` on tri-tender-pricing-mcp "
+    "to generate a detailed pricing table, followed by "
+    "`generate_pricing_report_html` to produce the final styled HTML "
+    "pricing report. You may also call `compare_pricing_scenarios` "
+    "to run low/balanced/premium what-if comparisons."
+)
+
+_MISSING_SPEC_RESPONSE: Final[Mapping[str, Any]] = MappingProxyType({
+    "status": "missing_pricing_spec",
+    "needs_pricing_spec": True,
+    "instructions_for_client_llm": _MISSING_SPEC_INSTRUCTIONS,
+})
+
+_READY_RESPONSE: Final[Mapping[str, Any]] = MappingProxyType({
+    "status": "ready_for_pricing_model",
+    "needs_pricing_spec": False,
+    "instructions_for_client_llm": _READY_INSTRUCTIONS,
+})
+
 
 @mcp.tool
-def pricing_entrypoint(
+async def pricing_entrypoint(
     tender_id: str,
     tender_title: Optional[str] = None,
     tender_reference: Optional[str] = None,
@@ -48,48 +111,18 @@ def pricing_entrypoint(
     }
 
     if not pricing_requirements:
-        instructions = (
-            "No structured pricing_requirements were provided to the "
-            "tri-tender-pricing-mcp.\n\n"
-            "Next steps for the client LLM (Tri-Tender Orchestrator):\n"
-            "1) Ask the user to upload the pricing schedule / Bill of "
-            "   Quantities (BOQ) or any annexure that contains the "
-            "   rates, quantities and units to be priced.\n"
-            "2) Use the 'tender-docs-mcp-file-resource' MCP to parse the "
-            "   uploaded pricing document and extract line items into a "
-            "   structured list.\n"
-            "   Example (pseudo-call):\n"
-            "     tender-docs-mcp-file-resource__extract_pricing_requirements(\n"
-            "         file=uploaded_pricing_file\n"
-            "     )\n"
-            "3) Call pricing_entrypoint AGAIN, this time passing the "
-            "   extracted pricing_requirements list into this tool.\n"
-        )
-
-        return {
-            "status": "missing_pricing_spec",
-            "needs_pricing_spec": True,
-            "instructions_for_client_llm": instructions,
-            "tender_context": tender_context,
-        }
+        return {**_MISSING_SPEC_RESPONSE, "tender_context": tender_context}
 
     pricing_analysis = None    # optional notes/flags
     if parsed_pricing_spec_text:
-        pricing_analysis = analyze_pricing_spec_text(
+        pricing_analysis = await _run_in_pool(
+            analyze_pricing_spec_text,
             parsed_pricing_spec_text,
             tender_type=tender_type,
         )
 
     return {
-        "status": "ready_for_pricing_model",
-        "needs_pricing_spec": False,
-        "instructions_for_client_llm": (
-            "You may now call `build_pricing_model` on tri-tender-pricing-mcp "
-            "to generate a detailed pricing table, followed by "
-            "`generate_pricing_report_html` to produce the final styled HTML "
-            "pricing report. You may also call `compare_pricing_scenarios` "
-            "to run low/balanced/premium what-if comparisons."
-        ),
+        **_READY_RESPONSE,
         "tender_context": tender_context,
         "pricing_requirements": pricing_requirements,
         "pricing_analysis": pricing_analysis,
@@ -97,8 +130,8 @@ def pricing_entrypoint(
 
 
 @mcp.tool
-def build_pricing_model(
-    pricing_items: List[Dict[str, Any]],
+async def build_pricing_model(
+    pricing_items: List[PricingItemInput],
     strategy: Literal["low_cost", "balanced", "premium"] = "balanced",
     overhead_pct: float = 15.0,
     profit_margin_pct: float = 20.0,
@@ -112,12 +145,9 @@ def build_pricing_model(
     Applies overheads, profit, contingency and tax. All calculations are
     returned so the client LLM can explain or adjust them with the user.
     """
-    typed_items: List[PricingItemInput] = [
-        PricingItemInput(**item) for item in pricing_items
-    ]
-
-    pricing_table = build_pricing_table(
-        typed_items=typed_items,
+    pricing_table = await _run_in_pool(
+        build_pricing_table,
+        typed_items=pricing_items,
         strategy=strategy,
         overhead_pct=overhead_pct,
         profit_margin_pct=profit_margin_pct,
@@ -129,9 +159,21 @@ def build_pricing_model(
     return pricing_table
 
 
+# Totals reported per strategy in compare_pricing_scenarios, fetched from
+# each scenario in a single itemgetter call.
+_COMPARISON_FIELDS = (
+    "total_excl_tax",
+    "total_incl_tax",
+    "profit_amount",
+    "overhead_amount",
+    "contingency_amount",
+)
+_comparison_totals = operator.itemgetter(*_COMPARISON_FIELDS)
+
+
 @mcp.tool
-def compare_pricing_scenarios(
-    pricing_items: List[Dict[str, Any]],
+async def compare_pricing_scenarios(
+    pricing_items: List[PricingItemInput],
     strategies: Optional[List[Literal["low_cost", "balanced", "premium"]]] = None,
     overhead_pct: float = 15.0,
     profit_margin_pct: float = 20.0,
@@ -149,34 +191,37 @@ def compare_pricing_scenarios(
     if strategies is None or len(strategies) == 0:
         strategies = ["low_cost", "balanced", "premium"]
 
-    typed_items: List[PricingItemInput] = [
-        PricingItemInput(**item) for item in pricing_items
-    ]
-
-    scenarios: Dict[str, Any] = {}
-    comparison_list: List[Dict[str, Any]] = []
-
-    for strat in strategies:
-        model = build_pricing_table(
-            typed_items=typed_items,
-            strategy=strat,
-            overhead_pct=overhead_pct,
-            profit_margin_pct=profit_margin_pct,
-            contingency_pct=contingency_pct,
-            tax_rate_pct=tax_rate_pct,
-            currency_symbol=currency_symbol,
-        )
-        scenarios[strat] = model
-
-        totals = model.get("totals", {})
-        comparison_list.append({
+    # Item columns are extracted once and shared across strategies.
+    scenarios: Dict[str, Any] = await _run_in_pool(
+        build_pricing_scenarios,
+        typed_items=pricing_items,
+        strategies=strategies,
+        overhead_pct=overhead_pct,
+        profit_margin_pct=profit_margin_pct,
+        contingency_pct=contingency_pct,
+        tax_rate_pct=tax_rate_pct,
+        currency_symbol=currency_symbol,
+    )
+    comparison_rows = map(
+        _comparison_totals, (scenarios[strat]["totals"] for strat in strategies)
+    )
+    comparison_list: List[Dict[str, Any]] = [
+        {
             "strategy": strat,
-            "total_excl_tax": totals.get("total_excl_tax", 0.0),
-            "total_incl_tax": totals.get("total_incl_tax", 0.0),
-            "profit_amount": totals.get("profit_amount", 0.0),
-            "overhead_amount": totals.get("overhead_amount", 0.0),
-            "contingency_amount": totals.get("contingency_amount", 0.0),
-        })
+            "total_excl_tax": total_excl_tax,
+            "total_incl_tax": total_incl_tax,
+            "profit_amount": profit_amount,
+            "overhead_amount": overhead_amount,
+            "contingency_amount": contingency_amount,
+        }
+        for strat, (
+            total_excl_tax,
+            total_incl_tax,
+            profit_amount,
+            overhead_amount,
+            contingency_amount,
+        ) in zip(strategies, comparison_rows)
+    ]
 
     return {
         "scenarios": scenarios,
@@ -188,7 +233,7 @@ def compare_pricing_scenarios(
 
 
 @mcp.tool
-def generate_pricing_report_html(
+async def generate_pricing_report_html(
     tender_context: Dict[str, Any],
     company_context: Dict[str, Any],
     pricing_model: Dict[str, Any],
@@ -197,15 +242,14 @@ def generate_pricing_report_html(
     """
     Render a styled HTML pricing report suitable for PDF conversion.
     """
-    html = render_pricing_report_html(
+    html = await _run_in_pool(
+        render_pricing_report_html,
         tender_context=tender_context,
         company_context=company_context,
         pricing_model=pricing_model,
         additional_notes=additional_notes,
     )
 
-    from datetime import datetime, timezone
-
     metadata = {
         "tender_context": tender_context,
         "company_context": company_context,